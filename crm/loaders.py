@@ -0,0 +1,37 @@
+from .models import Customer, Product
+
+# Per-request loaders that batch primary-key lookups into one IN query
+# and cache the results, so repeated get(pk=...) calls made while
+# resolving a single GraphQL request hit the database at most once.
+
+class ModelLoader:
+    model = None
+    # Columns the mutation paths actually read; everything else stays
+    # deferred and is fetched lazily in the rare case it is touched
+    only_fields = ()
+
+    def __init__(self):
+        self._cache = {}
+
+    def load(self, pk):
+        return self.load_many([pk])[0]
+
+    def load_many(self, pks):
+        missing = [pk for pk in pks if str(pk) not in self._cache]
+        if missing:
+            qs = self.model.objects
+            if self.only_fields:
+                qs = qs.only(*self.only_fields)
+            for obj in qs.in_bulk(missing).values():
+                self._cache[str(obj.pk)] = obj
+        return [self._cache.get(str(pk)) for pk in pks]
+
+
+class CustomerLoader(ModelLoader):
+    model = Customer
+    only_fields = ('id',)
+
+
+class ProductLoader(ModelLoader):
+    model = Product
+    only_fields = ('id', 'price')
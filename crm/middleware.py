@@ -0,0 +1,17 @@
+from .loaders import CustomerLoader, ProductLoader
+
+
+class LoaderMiddleware:
+    """Attach fresh per-request loaders to the request object.
+
+    graphene-django passes the Django request as ``info.context``, so
+    resolvers and mutations can reach the loaders without any globals.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.customer_loader = CustomerLoader()
+        request.product_loader = ProductLoader()
+        return self.get_response(request)
@@ -1,7 +1,10 @@
+from decimal import Decimal
+
 from django.db import models
+from django.db.models import Sum
+from django.db.models.functions import Lower
 
 # Create your models here.
-from django.db import models
 
 class Customer(models.Model):
     name = models.CharField(max_length=100)
@@ -9,6 +12,13 @@ class Customer(models.Model):
     phone = models.CharField(max_length=20, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            # DB-enforced case-insensitive uniqueness; the backing index
+            # also serves any LOWER(email) duplicate probe
+            models.UniqueConstraint(Lower('email'), name='customer_email_ci_uniq'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -28,5 +38,11 @@ class Order(models.Model):
     total_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     order_date = models.DateTimeField(auto_now_add=True)
 
+    def recalc_total(self):
+        # Aggregate in SQL instead of summing hydrated Product rows in Python
+        total = self.products.aggregate(s=Sum('price'))['s'] or Decimal('0.00')
+        self.total_amount = total
+        self.save(update_fields=['total_amount'])
+
     def __str__(self):
         return f"Order {self.id} - {self.customer.name}"
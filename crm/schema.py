@@ -1,11 +1,11 @@
-import re
 from decimal import Decimal
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 import graphene
 from graphene_django import DjangoObjectType
 from graphene_django.filter import DjangoFilterConnectionField  # ✅ required for filtering and relay
 from .models import Customer, Product, Order
+from .loaders import CustomerLoader, ProductLoader
 
 # ---------- Types ----------
 class CustomerType(DjangoObjectType):
@@ -27,12 +27,24 @@ class OrderType(DjangoObjectType):
         interfaces = (graphene.relay.Node,)
 
 # ---------- Utility validations ----------
-PHONE_REGEX = re.compile(r"^(\+\d{7,15}|\d{3}-\d{3}-\d{4})$")
-
 def validate_phone(phone: str) -> bool:
+    # Accepts +1234567890 (7-15 digits) or 123-456-7890, checked with
+    # plain slice/isdigit tests instead of a regex engine pass
     if not phone:
         return True
-    return bool(PHONE_REGEX.match(phone))
+    # Cheap length gate first: +7..15 digits spans 8-16 chars and the
+    # dashed form is exactly 12, so anything outside that can't match
+    if not 8 <= len(phone) <= 16:
+        return False
+    if phone.startswith('+'):
+        digits = phone[1:]
+        return 7 <= len(digits) <= 15 and digits.isascii() and digits.isdigit()
+    return (
+        len(phone) == 12
+        and phone[3] == '-' and phone[7] == '-'
+        and phone.replace('-', '').isascii()
+        and phone[:3].isdigit() and phone[4:7].isdigit() and phone[8:].isdigit()
+    )
 
 # ---------- Mutations ----------
 class CreateCustomer(graphene.Mutation):
@@ -49,15 +61,19 @@ class CreateCustomer(graphene.Mutation):
     def mutate(cls, root, info, name, email, phone=None):
         errors = []
         email = email.strip().lower()
-        if Customer.objects.filter(email=email).exists():
-            errors.append("Email already exists")
-            return CreateCustomer(customer=None, message="Failed", errors=errors)
-
         if phone and not validate_phone(phone):
             errors.append("Invalid phone format. Use +1234567890 or 123-456-7890")
             return CreateCustomer(customer=None, message="Failed", errors=errors)
 
-        customer = Customer.objects.create(name=name.strip(), email=email, phone=phone)
+        # Let the unique constraint on email do the duplicate check
+        # instead of a racy exists() SELECT before the INSERT
+        try:
+            with transaction.atomic():
+                customer = Customer.objects.create(name=name.strip(), email=email, phone=phone)
+        except IntegrityError:
+            errors.append("Email already exists")
+            return CreateCustomer(customer=None, message="Failed", errors=errors)
+
         return CreateCustomer(customer=customer, message="Customer created successfully", errors=None)
 
 class CustomerInput(graphene.InputObjectType):
@@ -74,39 +90,60 @@ class BulkCreateCustomers(graphene.Mutation):
 
     @classmethod
     def mutate(cls, root, info, customers):
-        created = []
         errors = []
 
-        with transaction.atomic():
-            for idx, data in enumerate(customers):
-                name = data.get('name')
-                email = data.get('email')
-                phone = data.get('phone', None)
-
-                sid = transaction.savepoint()
-                try:
-                    if not name or not email:
-                        errors.append(f"Record {idx}: name and email are required")
-                        transaction.savepoint_rollback(sid)
-                        continue
-
-                    email_norm = email.strip().lower()
-                    if Customer.objects.filter(email=email_norm).exists():
-                        errors.append(f"Record {idx}: Email already exists ({email})")
-                        transaction.savepoint_rollback(sid)
-                        continue
-
-                    if phone and not validate_phone(phone):
-                        errors.append(f"Record {idx}: Invalid phone format ({phone})")
-                        transaction.savepoint_rollback(sid)
-                        continue
-
-                    c = Customer.objects.create(name=name.strip(), email=email_norm, phone=phone)
-                    created.append(c)
-                    transaction.savepoint_commit(sid)
-                except Exception as exc:
-                    transaction.savepoint_rollback(sid)
-                    errors.append(f"Record {idx}: Unexpected error: {str(exc)}")
+        # Normalize the whole payload in one pass so each email is
+        # stripped/lowered exactly once, for both the duplicate SELECT
+        # and the per-record validation below
+        records = [
+            (
+                idx,
+                data.get('name'),
+                data.get('email'),
+                data['email'].strip().lower() if data.get('email') else None,
+                data.get('phone', None),
+            )
+            for idx, data in enumerate(customers)
+        ]
+
+        # One SELECT for every email in the payload instead of one exists() per record
+        emails = [email_norm for _, _, _, email_norm, _ in records if email_norm]
+        existing = set(
+            Customer.objects.filter(email__in=emails).values_list('email', flat=True)
+        )
+
+        # Emails accepted earlier in this payload count as taken too, so
+        # the first occurrence of a repeat wins and later ones error out
+        seen = set()
+        to_create = []
+        for idx, name, email, email_norm, phone in records:
+            if not name or not email:
+                errors.append(f"Record {idx}: name and email are required")
+                continue
+
+            if email_norm in existing:
+                errors.append(f"Record {idx}: Email already exists ({email})")
+                continue
+            if email_norm in seen:
+                errors.append(f"Record {idx}: Duplicate email in payload ({email})")
+                continue
+
+            if phone and not validate_phone(phone):
+                errors.append(f"Record {idx}: Invalid phone format ({phone})")
+                continue
+
+            seen.add(email_norm)
+            to_create.append(Customer(name=name.strip(), email=email_norm, phone=phone))
+
+        # No ignore_conflicts here: it would stop the backend returning
+        # primary keys, and the payload is already deduped above. A race
+        # with a concurrent insert surfaces as IntegrityError instead.
+        try:
+            with transaction.atomic():
+                created = Customer.objects.bulk_create(to_create, batch_size=500)
+        except IntegrityError:
+            created = []
+            errors.append("Bulk insert failed: an email was just taken by another request")
 
         return BulkCreateCustomers(customers=created, errors=errors if errors else None)
 
@@ -122,12 +159,7 @@ class CreateProduct(graphene.Mutation):
     @classmethod
     def mutate(cls, root, info, name, price, stock=0):
         errors = []
-        try:
-            price = Decimal(price)
-        except Exception:
-            errors.append("Price must be a valid decimal number")
-            return CreateProduct(product=None, errors=errors)
-
+        # graphene.Decimal already delivers a Decimal; no re-parse needed
         if price <= 0:
             errors.append("Price must be positive")
         if stock is None:
@@ -153,9 +185,13 @@ class CreateOrder(graphene.Mutation):
     @classmethod
     def mutate(cls, root, info, customer_id, product_ids, order_date=None):
         errors = []
-        try:
-            customer = Customer.objects.get(pk=customer_id)
-        except Customer.DoesNotExist:
+        # Per-request loaders batch and cache pk lookups; fall back to
+        # fresh instances when the middleware is not installed
+        customer_loader = getattr(info.context, 'customer_loader', None) or CustomerLoader()
+        product_loader = getattr(info.context, 'product_loader', None) or ProductLoader()
+
+        customer = customer_loader.load(customer_id)
+        if customer is None:
             errors.append("Invalid customer ID")
             return CreateOrder(order=None, errors=errors)
 
@@ -163,30 +199,56 @@ class CreateOrder(graphene.Mutation):
             errors.append("At least one product must be selected")
             return CreateOrder(order=None, errors=errors)
 
-        products = []
+        # The loader runs the only('id','price').in_bulk() query and
+        # caches the rows for any later lookup in the same request
+        products_by_id = {
+            p.pk: p for p in product_loader.load_many(product_ids) if p is not None
+        }
+        found_ids = {str(pk) for pk in products_by_id}
         for pid in product_ids:
-            try:
-                p = Product.objects.get(pk=pid)
-                products.append(p)
-            except Product.DoesNotExist:
+            if str(pid) not in found_ids:
                 errors.append(f"Invalid product ID: {pid}")
 
         if errors:
             return CreateOrder(order=None, errors=errors)
 
+        # Total is known before the INSERT, so write it in one go rather
+        # than INSERT-then-UPDATE
+        total = sum((p.price for p in products_by_id.values()), Decimal('0.00'))
+
         with transaction.atomic():
             order = Order.objects.create(
                 customer=customer,
-                order_date=order_date or timezone.now()
+                order_date=order_date or timezone.now(),
+                total_amount=total,
+            )
+            # Insert all M2M rows in one statement; .set() would first
+            # SELECT the existing links of this brand-new order
+            through = Order.products.through
+            through.objects.bulk_create(
+                [through(order_id=order.pk, product_id=pk) for pk in products_by_id]
             )
-            order.products.set(products)
-            total = sum((p.price for p in products), Decimal('0.00'))
-            order.total_amount = total
-            order.save()
 
         return CreateOrder(order=order, errors=None)
 
 # ---------- Schema exports ----------
+def selected_field_names(info):
+    """Collect every field name selected anywhere in the current query."""
+    names = set()
+
+    def walk(selection_set):
+        if selection_set is None:
+            return
+        for sel in selection_set.selections:
+            name = getattr(getattr(sel, 'name', None), 'value', None)
+            if name:
+                names.add(name)
+            walk(getattr(sel, 'selection_set', None))
+
+    for node in info.field_nodes:
+        walk(node.selection_set)
+    return names
+
 class Query(graphene.ObjectType):
     # ✅ Relay-compatible filter fields
     all_customers = DjangoFilterConnectionField(CustomerType)
@@ -194,13 +256,22 @@ class Query(graphene.ObjectType):
     all_orders = DjangoFilterConnectionField(OrderType)
 
     def resolve_all_customers(root, info, **kwargs):
-        return Customer.objects.all()
+        qs = Customer.objects.all()
+        # Only prefetch the reverse relation when the client asked for it
+        if 'orderSet' in selected_field_names(info):
+            qs = qs.prefetch_related('order_set')
+        return qs
 
     def resolve_all_products(root, info, **kwargs):
-        return Product.objects.all()
+        qs = Product.objects.all()
+        if 'orderSet' in selected_field_names(info):
+            qs = qs.prefetch_related('order_set')
+        return qs
 
     def resolve_all_orders(root, info, **kwargs):
-        return Order.objects.all()
+        # One JOIN for customer plus one IN query for products instead of
+        # a pair of queries per order row
+        return Order.objects.select_related('customer').prefetch_related('products').all()
 
 class Mutation(graphene.ObjectType):
     create_customer = CreateCustomer.Field()